@@ -1,11 +1,16 @@
 import os
 from dotenv import load_dotenv
 import json
-from typing import List
+import functools
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
 import boto3
 from omega import constants
 
-load_dotenv(override=True)
+
+@functools.lru_cache(maxsize=None)
+def _load_dotenv() -> None:
+    load_dotenv(override=True)
 
 def get_secret(secret_name, region_name):
     # Create a Secrets Manager client
@@ -28,78 +33,165 @@ def get_secret(secret_name, region_name):
     return secret
 
 def parse_proxies(proxy_list: List[str]) -> List[str]:
-    transformed_proxies = []
-    for proxy in proxy_list:
-        proxy_ip, proxy_port, proxy_user, proxy_pass = proxy.split(':')
-        transformed_proxies.append(f"http://{proxy_user}:{proxy_pass}@{proxy_ip}:{proxy_port}")
-    return transformed_proxies
-
-NETWORK = os.environ["NETWORK"]
-NETUID = int(os.environ["NETUID"])
-
-ENABLE_COMMUNE = True if os.environ["ENABLE_COMMUNE"] == "True" else False
-print("Running with ENABLE_COMMUNE:", ENABLE_COMMUNE)
-COMMUNE_NETWORK = os.environ["COMMUNE_NETWORK"]
-COMMUNE_NETUID = int(os.environ["COMMUNE_NETUID"])
+    # maxsplit=3 keeps any ':' inside the password intact
+    return [
+        f"http://{proxy_user}:{proxy_pass}@{proxy_ip}:{proxy_port}"
+        for proxy_ip, proxy_port, proxy_user, proxy_pass
+        in (proxy.split(':', 3) for proxy in proxy_list)
+    ]
 
 API_KEY_NAME = "OMEGA_MM_API_KEY"
-API_KEYS = json.loads(os.environ["API_KEYS"])
-
-PINECONE_API_KEY = os.environ["PINECONE_API_KEY"]
-PINECONE_INDEX = os.environ["PINECONE_INDEX"]
-PINECONE_AUDIO_INDEX = os.environ["PINECONE_AUDIO_INDEX"]
-HF_TOKEN = os.environ["HF_TOKEN"]
-HF_REPO = os.environ["HF_REPO"]
-HF_AUDIO_REPO = os.environ["HF_AUDIO_REPO"]
 REPO_TYPE = "dataset"
-TOPICS_LIST = json.loads(os.environ["TOPICS_LIST"])
-PROXY_LIST = parse_proxies(json.loads(os.environ["PROXY_LIST"]))
-IS_PROD = os.environ.get("IS_PROD", "false").lower() == "true"
-CHECK_PROBABILITY = float(os.environ.get("CHECK_PROBABILITY", 0.1))
-UPLOAD_BATCH_SIZE = int(os.environ.get("UPLOAD_BATCH_SIZE", 1024))
-UPLOAD_AUDIO_BATCH_SIZE = int(os.environ.get("UPLOAD_AUDIO_BATCH_SIZE", 256))
-
-DB_CONFIG = {
-    'user': os.environ["DBUSER"],
-    'password': os.environ["DBPASS"],
-    'host': os.environ["DBHOST"],
-    'database': os.environ["DBNAME"]
-}
-
-# Omega Focus Constants
-FOCUS_DB_HOST = os.environ["FOCUS_DB_HOST"]
-FOCUS_DB_NAME = os.environ["FOCUS_DB_NAME"]
-FOCUS_DB_USER = os.environ["FOCUS_DB_USER"]
-FOCUS_DB_PASSWORD = os.environ["FOCUS_DB_PASSWORD"]
-FOCUS_DB_PORT = os.getenv("FOCUS_DB_PORT", 5432)
 DB_STRING_LENGTH = 200
 DB_STRING_LENGTH_LONG = 500
-ENCRYPTION_KEY = os.environ["ENCRYPTION_KEY"]
 
 BT_TESTNET = "test"
 BT_MAINNET = "finney"
-assert NETWORK in [BT_TESTNET, BT_MAINNET], "SUBTENSOR_NETWORK must be either test or finney"
-TAO_REFRESH_INTERVAL_MINUTES = int(os.getenv('TAO_REFRESH_INTERVAL_MINUTES', 10))
-
-FOCUS_REWARDS_PERCENT = float(os.getenv('FOCUS_REWARDS_PERCENT', constants.FOCUS_REWARDS_PERCENT))
-FOCUS_API_KEYS = json.loads(os.environ["FOCUS_API_KEYS"])
-GOOGLE_AI_API_KEY = os.environ["GOOGLE_AI_API_KEY"]
-OPENAI_API_KEY = os.environ["OPENAI_API_KEY"]
-AWS_ACCESS_KEY_ID = os.environ["AWS_ACCESS_KEY_ID"]
-AWS_SECRET_ACCESS_KEY = os.environ["AWS_SECRET_ACCESS_KEY"]
-AWS_S3_REGION = os.environ["AWS_S3_REGION"]
-AWS_S3_BUCKET_NAME = os.environ["AWS_S3_BUCKET_NAME"]
-
-MAX_FOCUS_POINTS_PER_HOUR = int(os.getenv("MAX_FOCUS_POINTS_PER_HOUR", 80))  # $80 / hour
-FIXED_TAO_USD_ESTIMATE = float(os.getenv("FIXED_TAO_USD_ESTIMATE", 300.0))
-BOOSTED_TASKS_PERCENTAGE = float(os.getenv("BOOSTED_TASKS_PERCENTAGE", 0.7))
-
-GOOGLE_PROJECT_ID = os.getenv("GOOGLE_PROJECT_ID")
-GOOGLE_LOCATION = os.getenv("GOOGLE_LOCATION", "us-central1")
-GOOGLE_APPLICATION_CREDENTIALS = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
-GOOGLE_CLOUD_BUCKET_NAME = os.getenv("GOOGLE_CLOUD_BUCKET_NAME")
-
-with open(GOOGLE_APPLICATION_CREDENTIALS, "w") as f:
-    f.write(get_secret("prod/gcp_service_user", region_name=AWS_S3_REGION))
-
-SENTRY_DSN = os.getenv("SENTRY_DSN")
+
+
+@dataclass(frozen=True)
+class Config:
+    NETWORK: str
+    NETUID: int
+
+    ENABLE_COMMUNE: bool
+    COMMUNE_NETWORK: str
+    COMMUNE_NETUID: int
+
+    PINECONE_API_KEY: str
+    PINECONE_INDEX: str
+    PINECONE_AUDIO_INDEX: str
+    HF_TOKEN: str
+    HF_REPO: str
+    HF_AUDIO_REPO: str
+    IS_PROD: bool
+    CHECK_PROBABILITY: float
+    UPLOAD_BATCH_SIZE: int
+    UPLOAD_AUDIO_BATCH_SIZE: int
+
+    DB_CONFIG: Dict[str, str]
+
+    # Omega Focus Constants
+    FOCUS_DB_HOST: str
+    FOCUS_DB_NAME: str
+    FOCUS_DB_USER: str
+    FOCUS_DB_PASSWORD: str
+    FOCUS_DB_PORT: Any
+    ENCRYPTION_KEY: str
+
+    TAO_REFRESH_INTERVAL_MINUTES: int
+
+    FOCUS_REWARDS_PERCENT: float
+    GOOGLE_AI_API_KEY: str
+    OPENAI_API_KEY: str
+    AWS_ACCESS_KEY_ID: str
+    AWS_SECRET_ACCESS_KEY: str
+    AWS_S3_REGION: str
+    AWS_S3_BUCKET_NAME: str
+
+    MAX_FOCUS_POINTS_PER_HOUR: int  # $80 / hour
+    FIXED_TAO_USD_ESTIMATE: float
+    BOOSTED_TASKS_PERCENTAGE: float
+
+    GOOGLE_PROJECT_ID: Optional[str]
+    GOOGLE_LOCATION: str
+    GOOGLE_APPLICATION_CREDENTIALS: Optional[str]
+    GOOGLE_CLOUD_BUCKET_NAME: Optional[str]
+
+    SENTRY_DSN: Optional[str]
+
+    # JSON-encoded settings are parsed on first access only.
+    @functools.cached_property
+    def API_KEYS(self) -> List[str]:
+        return json.loads(os.environ["API_KEYS"])
+
+    @functools.cached_property
+    def TOPICS_LIST(self) -> List[str]:
+        return json.loads(os.environ["TOPICS_LIST"])
+
+    @functools.cached_property
+    def PROXY_LIST(self) -> List[str]:
+        return parse_proxies(json.loads(os.environ["PROXY_LIST"]))
+
+    @functools.cached_property
+    def PROXY_CHOICES(self) -> List[Optional[str]]:
+        # PROXY_LIST plus None for a direct connection
+        return self.PROXY_LIST + [None]
+
+    @functools.cached_property
+    def FOCUS_API_KEYS(self) -> List[str]:
+        return json.loads(os.environ["FOCUS_API_KEYS"])
+
+
+@functools.lru_cache(maxsize=1)
+def get_config() -> Config:
+    """Read the environment once; every later lookup reuses the same Config."""
+    _load_dotenv()
+    config = Config(
+        NETWORK=os.environ["NETWORK"],
+        NETUID=int(os.environ["NETUID"]),
+
+        ENABLE_COMMUNE=os.environ["ENABLE_COMMUNE"] == "True",
+        COMMUNE_NETWORK=os.environ["COMMUNE_NETWORK"],
+        COMMUNE_NETUID=int(os.environ["COMMUNE_NETUID"]),
+
+        PINECONE_API_KEY=os.environ["PINECONE_API_KEY"],
+        PINECONE_INDEX=os.environ["PINECONE_INDEX"],
+        PINECONE_AUDIO_INDEX=os.environ["PINECONE_AUDIO_INDEX"],
+        HF_TOKEN=os.environ["HF_TOKEN"],
+        HF_REPO=os.environ["HF_REPO"],
+        HF_AUDIO_REPO=os.environ["HF_AUDIO_REPO"],
+        IS_PROD=os.environ.get("IS_PROD", "false").lower() == "true",
+        CHECK_PROBABILITY=float(os.environ.get("CHECK_PROBABILITY", 0.1)),
+        UPLOAD_BATCH_SIZE=int(os.environ.get("UPLOAD_BATCH_SIZE", 1024)),
+        UPLOAD_AUDIO_BATCH_SIZE=int(os.environ.get("UPLOAD_AUDIO_BATCH_SIZE", 256)),
+
+        DB_CONFIG={
+            'user': os.environ["DBUSER"],
+            'password': os.environ["DBPASS"],
+            'host': os.environ["DBHOST"],
+            'database': os.environ["DBNAME"]
+        },
+
+        FOCUS_DB_HOST=os.environ["FOCUS_DB_HOST"],
+        FOCUS_DB_NAME=os.environ["FOCUS_DB_NAME"],
+        FOCUS_DB_USER=os.environ["FOCUS_DB_USER"],
+        FOCUS_DB_PASSWORD=os.environ["FOCUS_DB_PASSWORD"],
+        FOCUS_DB_PORT=os.getenv("FOCUS_DB_PORT", 5432),
+        ENCRYPTION_KEY=os.environ["ENCRYPTION_KEY"],
+
+        TAO_REFRESH_INTERVAL_MINUTES=int(os.getenv('TAO_REFRESH_INTERVAL_MINUTES', 10)),
+
+        FOCUS_REWARDS_PERCENT=float(os.getenv('FOCUS_REWARDS_PERCENT', constants.FOCUS_REWARDS_PERCENT)),
+        GOOGLE_AI_API_KEY=os.environ["GOOGLE_AI_API_KEY"],
+        OPENAI_API_KEY=os.environ["OPENAI_API_KEY"],
+        AWS_ACCESS_KEY_ID=os.environ["AWS_ACCESS_KEY_ID"],
+        AWS_SECRET_ACCESS_KEY=os.environ["AWS_SECRET_ACCESS_KEY"],
+        AWS_S3_REGION=os.environ["AWS_S3_REGION"],
+        AWS_S3_BUCKET_NAME=os.environ["AWS_S3_BUCKET_NAME"],
+
+        MAX_FOCUS_POINTS_PER_HOUR=int(os.getenv("MAX_FOCUS_POINTS_PER_HOUR", 80)),
+        FIXED_TAO_USD_ESTIMATE=float(os.getenv("FIXED_TAO_USD_ESTIMATE", 300.0)),
+        BOOSTED_TASKS_PERCENTAGE=float(os.getenv("BOOSTED_TASKS_PERCENTAGE", 0.7)),
+
+        GOOGLE_PROJECT_ID=os.getenv("GOOGLE_PROJECT_ID"),
+        GOOGLE_LOCATION=os.getenv("GOOGLE_LOCATION", "us-central1"),
+        GOOGLE_APPLICATION_CREDENTIALS=os.getenv("GOOGLE_APPLICATION_CREDENTIALS"),
+        GOOGLE_CLOUD_BUCKET_NAME=os.getenv("GOOGLE_CLOUD_BUCKET_NAME"),
+
+        SENTRY_DSN=os.getenv("SENTRY_DSN"),
+    )
+    print("Running with ENABLE_COMMUNE:", config.ENABLE_COMMUNE)
+    assert config.NETWORK in [BT_TESTNET, BT_MAINNET], "SUBTENSOR_NETWORK must be either test or finney"
+
+    with open(config.GOOGLE_APPLICATION_CREDENTIALS, "w") as f:
+        f.write(get_secret("prod/gcp_service_user", region_name=config.AWS_S3_REGION))
+
+    return config
+
+
+def __getattr__(name: str):
+    # Module-level settings (e.g. config.PROXY_LIST) are served from the cached Config.
+    if name in Config.__dataclass_fields__ or isinstance(Config.__dict__.get(name), functools.cached_property):
+        return getattr(get_config(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
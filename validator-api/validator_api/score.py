@@ -3,7 +3,9 @@ import random
 import uuid
 from typing import List, Tuple, Optional, BinaryIO
 import math
+from collections import OrderedDict
 
+import numpy as np
 from pinecone import Pinecone
 import torch
 import torch.nn.functional as F
@@ -56,111 +58,115 @@ AUDIO_TYPE = "audio"
 DESCRIPTION_TYPE = "description"
 
 
-async def query_pinecone(vector: List[float]) -> float:
-    response = await run_async(
-        PINECONE_INDEX.query,
-        vector=vector,
-        top_k=1,
-        filter={
-            "modality_type": {"$eq": VIDEO_TYPE},
-        },
-    )
-    if len(response["matches"]) > 0:
-        return 1 - response["matches"][0]["score"] 
-    else:
-        print("No pinecone matches, returning 0")
-        return 0
+PINECONE_UPSERT_BATCH_SIZE = 96
+TEXT_EMBEDDING_CACHE_SIZE = 4096
+_text_embedding_cache: "OrderedDict[str, torch.Tensor]" = OrderedDict()
 
-async def get_pinecone_novelty(metadata: List[VideoMetadata]) -> List[float]:
+
+async def query_pinecone_batch(vectors: List[List[float]]) -> List[float]:
     """
-    Take the top match from the Pinecone index.
+    Take the top match from the Pinecone index for each vector. The client has no
+    multi-vector query endpoint, so all queries are issued concurrently.
     """
-    novelty_scores = await asyncio.gather(*[
-        query_pinecone(
-            vector=mdata.video_emb
+    responses = await asyncio.gather(*[
+        run_async(
+            PINECONE_INDEX.query,
+            vector=vector,
+            top_k=1,
+            filter={
+                "modality_type": {"$eq": VIDEO_TYPE},
+            },
         )
-        for mdata in metadata
-    ])    
+        for vector in vectors
+    ])
+    novelty_scores = []
+    for response in responses:
+        if len(response["matches"]) > 0:
+            novelty_scores.append(1 - response["matches"][0]["score"])
+        else:
+            print("No pinecone matches, returning 0")
+            novelty_scores.append(0)
     return novelty_scores
 
-def compute_novelty_score_among_batch(emb: Embeddings) -> List[float]:
-    video_tensor = emb.video
-    num_videos = video_tensor.shape[0]
+async def get_pinecone_novelty(metadata: List[VideoMetadata]) -> List[float]:
+    """
+    Take the top match from the Pinecone index.
+    """
+    return await query_pinecone_batch([mdata.video_emb for mdata in metadata])
+
+def compute_novelty_score_among_batch(video_arr: np.ndarray) -> List[float]:
+    norms = np.linalg.norm(video_arr, axis=-1, keepdims=True)
+    normalized = video_arr / np.maximum(norms, 1e-8)
+    num_videos = normalized.shape[0]
     novelty_scores = []
     for i in range(num_videos - 1):
-        similarity_score = F.cosine_similarity(video_tensor[[i]], video_tensor[i + 1:]).max()
-        novelty_scores.append(1 - similarity_score.item())
+        similarity_score = (normalized[i + 1:] @ normalized[i]).max()
+        novelty_scores.append(1 - float(similarity_score))
     novelty_scores.append(1.0)  # last video is 100% novel
     return novelty_scores
 
-async def async_zero() -> None:
-    return 0
-
-async def compute_novelty_score(embeddings: Embeddings) -> Tuple[float, List[bool]]:
-    local_novelty_scores = compute_novelty_score_among_batch(embeddings)
-    global_novelty_scores = await asyncio.gather(*[
-        async_zero() if local_score < DIFFERENCE_THRESHOLD else  # don't even query Pinecone if it's already too similar
-        query_pinecone(vector=embedding.tolist())
-        for embedding, local_score in zip(embeddings.video, local_novelty_scores)
-    ])
-    true_novelty_scores = [
-        min(local_score, global_score) for local_score, global_score
-        in zip(local_novelty_scores, global_novelty_scores)
+async def compute_novelty_score(video_arr: np.ndarray) -> Tuple[float, List[bool]]:
+    """Novelty of each video against the rest of the batch and the Pinecone index, on CPU."""
+    local_novelty_scores = compute_novelty_score_among_batch(video_arr)
+    # don't even query Pinecone if it's already too similar
+    query_idxs = [
+        idx for idx, local_score in enumerate(local_novelty_scores)
+        if local_score >= DIFFERENCE_THRESHOLD
     ]
-    is_too_similar = [score < DIFFERENCE_THRESHOLD for score in true_novelty_scores]
-    novelty_score = sum([
-        score for score, is_too_similar
-        in zip(true_novelty_scores, is_too_similar)
-        if not is_too_similar
-    ])
-    return novelty_score, is_too_similar
+    global_novelty_scores = np.zeros(len(local_novelty_scores), dtype=np.float64)
+    global_novelty_scores[query_idxs] = await query_pinecone_batch([video_arr[idx].tolist() for idx in query_idxs])
+    true_novelty_scores = np.minimum(np.asarray(local_novelty_scores, dtype=np.float64), global_novelty_scores)
+    is_too_similar = true_novelty_scores < DIFFERENCE_THRESHOLD
+    novelty_score = float(true_novelty_scores[~is_too_similar].sum())
+    return novelty_score, is_too_similar.tolist()
 
 
-def upload_to_pinecone(embeddings: Embeddings, metadata: List[VideoMetadata]) -> None:
+async def upload_to_pinecone(embeddings: Embeddings, metadata: List[VideoMetadata]) -> List[str]:
     video_ids = [str(uuid.uuid4()) for _ in range(len(metadata))]
-    try:
-        PINECONE_INDEX.upsert(
-            vectors=sum([
-                [
-                    {
-                        "id": f"{modality_type[:3]}{video_uuid}",
-                        "values": emb.tolist(),
-                        "metadata": {
-                            "youtube_id": video.video_id,
-                            "modality_type": modality_type,
-                        }
-                    }
-                    for emb, modality_type
-                    in zip(
-                        [embedding_vid, embedding_aud, embedding_des],
-                        [VIDEO_TYPE, AUDIO_TYPE, DESCRIPTION_TYPE]
-                    )
-                ]
-                for video_uuid, video, embedding_vid, embedding_aud, embedding_des
-                in zip(video_ids, metadata, embeddings.video, embeddings.audio, embeddings.description)
-            ], []),
+    vectors = [
+        {
+            "id": f"{modality_type[:3]}{video_uuid}",
+            "values": emb.tolist(),
+            "metadata": {
+                "youtube_id": video.video_id,
+                "modality_type": modality_type,
+            }
+        }
+        for video_uuid, video, embedding_vid, embedding_aud, embedding_des
+        in zip(video_ids, metadata, embeddings.video, embeddings.audio, embeddings.description)
+        for emb, modality_type
+        in zip(
+            [embedding_vid, embedding_aud, embedding_des],
+            [VIDEO_TYPE, AUDIO_TYPE, DESCRIPTION_TYPE]
         )
-    except Exception as e:
-        print(f"Failed to upload to Pinecone: {e}")
+    ]
+    # upsert in parallel chunks that stay under Pinecone's per-request size limit
+    results = await asyncio.gather(*[
+        run_async(PINECONE_INDEX.upsert, vectors=vectors[start:start + PINECONE_UPSERT_BATCH_SIZE])
+        for start in range(0, len(vectors), PINECONE_UPSERT_BATCH_SIZE)
+    ], return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception):
+            print(f"Failed to upload to Pinecone: {result}")
     return video_ids
 
 
-def upload_to_pinecone_audio(embeddings: Embeddings, metadata: List[AudioMetadata]) -> None:
+async def upload_to_pinecone_audio(embeddings: Embeddings, metadata: List[AudioMetadata]) -> List[str]:
     audio_ids = [str(uuid.uuid4()) for _ in range(len(metadata))]
+    vectors = [
+        {
+            "id": f"{audio_uuid}",
+            "values": embedding_aud.tolist(),
+            "metadata": {
+                "youtube_id": audio.video_id,
+            }
+        }
+        for audio_uuid, audio, embedding_aud
+        in zip(audio_ids, metadata, embeddings.audio)
+    ]
+    # only the network call goes to the threadpool
     try:
-        PINECONE_AUDIO_INDEX.upsert(
-            vectors=[
-                {
-                    "id": f"{audio_uuid}",
-                    "values": embedding_aud.tolist(),
-                    "metadata": {
-                        "youtube_id": audio.video_id,
-                    }
-                }
-                for audio_uuid, audio, embedding_aud
-                in zip(audio_ids, metadata, embeddings.audio)
-            ],
-        )
+        await run_async(PINECONE_AUDIO_INDEX.upsert, vectors=vectors)
     except Exception as e:
         print(f"Failed to upload to Pinecone: {e}")
     return audio_ids
@@ -172,13 +178,9 @@ async def upload_video_metadata(
     query: str, 
 ) -> None:
     # generate embeddings from our metadata
-    embeddings = Embeddings(
-        video=torch.stack([torch.tensor(v.video_emb) for v in metadata]),
-        audio=torch.stack([torch.tensor(v.audio_emb) for v in metadata]),
-        description=torch.stack([torch.tensor(v.description_emb) for v in metadata]),
-    )
+    embeddings = metadata_to_embeddings(metadata)
     # upload embeddings and metadata to pinecone
-    video_ids = await run_async(upload_to_pinecone, embeddings, metadata)
+    video_ids = await upload_to_pinecone(embeddings, metadata)
     # Schedule upload to HuggingFace
     video_dataset_uploader.add_videos(
         metadata,
@@ -202,8 +204,7 @@ async def upload_audio_metadata(
         audio=torch.stack([torch.tensor(v.audio_emb) for v in metadata]),
         description=None,
     )
-    audio_ids = await run_async(upload_to_pinecone_audio, embeddings, metadata)
-    audio_ids = [str(uuid.uuid4()) for _ in range(len(metadata))]
+    audio_ids = await upload_to_pinecone_audio(embeddings, metadata)
     audio_dataset_uploader.add_audios(
         metadata,
         audio_ids,
@@ -217,48 +218,128 @@ async def upload_audio_metadata(
     return audio_ids
 
 
-def filter_embeddings(embeddings: Embeddings, is_too_similar: List[bool]) -> Embeddings:
-    """Filter the embeddings based on whether they are too similar to the query."""
-    is_too_similar = torch.tensor(is_too_similar)
-    if embeddings.video is not None:
-        embeddings.video = embeddings.video[~is_too_similar]
-    if embeddings.audio is not None:
-        embeddings.audio = embeddings.audio[~is_too_similar]
-    if embeddings.description is not None:
-        embeddings.description = embeddings.description[~is_too_similar]
-    return embeddings
+def embeddings_from_arrays(
+    video: np.ndarray, audio: np.ndarray, description: np.ndarray, device: Optional[str] = None
+) -> Embeddings:
+    """Wrap per-modality float32 arrays as tensors, optionally moved to `device`."""
+    def to_tensor(arr: np.ndarray) -> torch.Tensor:
+        tensor = torch.from_numpy(arr)
+        if device is None:
+            return tensor
+        if torch.device(device).type == "cuda":
+            tensor = tensor.pin_memory()
+        return tensor.to(device, non_blocking=True)
+
+    return Embeddings(
+        video=to_tensor(video),
+        audio=to_tensor(audio),
+        description=to_tensor(description),
+    )
+
+
+def metadata_to_embeddings(metadata: List[VideoMetadata], device: Optional[str] = None) -> Embeddings:
+    """Build one contiguous float32 tensor per modality from the submitted embeddings."""
+    return embeddings_from_arrays(
+        np.asarray([v.video_emb for v in metadata], dtype=np.float32),
+        np.asarray([v.audio_emb for v in metadata], dtype=np.float32),
+        np.asarray([v.description_emb for v in metadata], dtype=np.float32),
+        device,
+    )
 
 
-def filter_stuffed_embeddings(embeddings: Embeddings, stuffed: List[Tuple[bool, float]]) -> Embeddings:
-    """Filter the embeddings based on whether they are too similar to the query."""
-    stuffed = torch.tensor([s for s, _ in stuffed])
+def collect_video_metadata(
+    videos: Videos,
+) -> Optional[Tuple[List[VideoMetadata], np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Validate, length-filter and pack the submitted videos in a single pass.
+
+    Returns None if any video id is invalid. Otherwise returns the first `num_videos`
+    videos within the allowed duration, along with their video, audio and description
+    embeddings as float32 arrays.
+    """
+    all_metadata = videos.video_metadata
+    capacity = max(min(len(all_metadata), videos.num_videos), 0)
+    metadata = []
+    video_arr = audio_arr = description_arr = None
+    for video_metadata in all_metadata:
+        if not video_utils.is_valid_youtube_id(video_metadata.video_id):
+            return None
+        if len(metadata) == capacity:
+            continue  # keep validating ids
+        duration = video_metadata.end_time - video_metadata.start_time
+        if duration > MAX_VIDEO_LENGTH or duration < MIN_VIDEO_LENGTH:
+            continue
+        if video_arr is None:
+            video_arr = np.empty((capacity, len(video_metadata.video_emb)), dtype=np.float32)
+            audio_arr = np.empty((capacity, len(video_metadata.audio_emb)), dtype=np.float32)
+            description_arr = np.empty((capacity, len(video_metadata.description_emb)), dtype=np.float32)
+        k = len(metadata)
+        video_arr[k] = video_metadata.video_emb
+        audio_arr[k] = video_metadata.audio_emb
+        description_arr[k] = video_metadata.description_emb
+        metadata.append(video_metadata)
+
+    if video_arr is None:
+        return metadata, None, None, None
+    k = len(metadata)
+    return metadata, video_arr[:k], audio_arr[:k], description_arr[:k]
+
+
+@torch.inference_mode()
+def select_embeddings(embeddings: Embeddings, keep: List[int]) -> Embeddings:
+    """Keep only the rows at `keep` in every modality, through one shared index tensor."""
+    tensors = [t for t in (embeddings.video, embeddings.audio, embeddings.description) if t is not None]
+    if not tensors:
+        return embeddings
+    keep_idx = torch.tensor(keep, dtype=torch.long, device=tensors[0].device)
     if embeddings.video is not None:
-        embeddings.video = embeddings.video[~stuffed]
+        embeddings.video = embeddings.video.index_select(0, keep_idx)
     if embeddings.audio is not None:
-        embeddings.audio = embeddings.audio[~stuffed]
+        embeddings.audio = embeddings.audio.index_select(0, keep_idx)
     if embeddings.description is not None:
-        embeddings.description = embeddings.description[~stuffed]
+        embeddings.description = embeddings.description.index_select(0, keep_idx)
     return embeddings
 
-def is_similar(emb_1: torch.Tensor, emb_2: List[float]) -> bool:
-    return F.cosine_similarity(
-        emb_1,
-        torch.tensor(emb_2, device=emb_1.device).unsqueeze(0)
-    ) > SIMILARITY_THRESHOLD
 
+def filter_metadata_and_embeddings(
+    metadata: List, embeddings: Embeddings, is_filtered: List[bool]
+) -> Tuple[List, Embeddings]:
+    """Drop the flagged entries from metadata and embeddings together, keeping them aligned."""
+    keep = [idx for idx, filtered in enumerate(is_filtered) if not filtered]
+    if len(keep) == len(is_filtered):
+        return metadata, embeddings
+    return [metadata[idx] for idx in keep], select_embeddings(embeddings, keep)
 
-def strict_is_similar(emb_1: torch.Tensor, emb_2: List[float]) -> bool:
-    return torch.allclose(emb_1, torch.tensor(emb_2, device=emb_1.device), atol=1e-4)
 
+@torch.inference_mode()
+def is_similar(emb_1: torch.Tensor, emb_2: torch.Tensor) -> bool:
+    """Row-wise check over (N, D) tensors; True only if every row pair is similar."""
+    return bool((F.cosine_similarity(emb_1, emb_2, dim=-1) > SIMILARITY_THRESHOLD).all())
 
-def metadata_check(metadata: List[VideoMetadata]) -> List[VideoMetadata]:
-    return [
-        video_metadata for video_metadata in metadata
-        if (
-            video_metadata.end_time - video_metadata.start_time <= MAX_VIDEO_LENGTH and
-            video_metadata.end_time - video_metadata.start_time >= MIN_VIDEO_LENGTH
-        )
-    ]
+
+@torch.inference_mode()
+def strict_is_similar(emb_1: torch.Tensor, emb_2: torch.Tensor) -> bool:
+    return torch.allclose(emb_1, emb_2, atol=1e-4)
+
+
+@torch.inference_mode()
+def compute_relevance_scores(
+    embeddings: Embeddings, query_emb: torch.Tensor
+) -> Tuple[List[float], List[float], List[float], List[float]]:
+    """
+    Cosine similarity of video and audio against the description and the query.
+    Each embedding is normalized once and the four scores are plain dot products.
+    """
+    video = F.normalize(embeddings.video, dim=-1)
+    audio = F.normalize(embeddings.audio, dim=-1)
+    description = F.normalize(embeddings.description, dim=-1)
+    query = F.normalize(query_emb, dim=-1)
+    return (
+        (video * description).sum(-1).tolist(),
+        (audio * description).sum(-1).tolist(),
+        (video @ query.T).squeeze(-1).tolist(),
+        (audio @ query.T).squeeze(-1).tolist(),
+    )
 
 
 def audio_metadata_check(metadata: List[AudioMetadata]) -> List[AudioMetadata]:
@@ -270,6 +351,7 @@ def audio_metadata_check(metadata: List[AudioMetadata]) -> List[AudioMetadata]:
         )
     ]
 
+@torch.inference_mode()
 def deduplicate_audios(embeddings: Embeddings) -> List[bool]:
     # return a list of booleans where True means the corresponding video is a duplicate i.e. is_similar
     audio_tensor = embeddings.audio
@@ -283,6 +365,7 @@ def deduplicate_audios(embeddings: Embeddings) -> List[bool]:
         
     return is_similar
 
+@torch.inference_mode()
 def compute_novelty_score_among_batch_audio(emb: Embeddings) -> List[float]:
     audio_tensor = emb.audio
     num_audios = audio_tensor.shape[0]
@@ -294,7 +377,7 @@ def compute_novelty_score_among_batch_audio(emb: Embeddings) -> List[float]:
     return novelty_scores
 
 def get_proxy_url() -> str:
-    return random.choice(config.PROXY_LIST + [None])
+    return random.choice(config.PROXY_CHOICES)
 
 
 async def get_random_video(metadata: List[VideoMetadata], check_video: bool) -> Optional[Tuple[VideoMetadata, Optional[BinaryIO]]]:
@@ -303,10 +386,9 @@ async def get_random_video(metadata: List[VideoMetadata], check_video: bool) ->
         return random_metadata, None
 
     random_video = None
-    metadata_copy = [v for v in metadata]  # list shallow copy
-    while random_video is None and len(metadata_copy) > 0:
-        idx = random.randint(0, len(metadata_copy) - 1)
-        random_metadata = metadata_copy.pop(idx)
+    # visit videos in a random order until one downloads
+    for idx in random.sample(range(len(metadata)), len(metadata)):
+        random_metadata = metadata[idx]
         try:
             async with DOWNLOAD_SEMAPHORE:
                 random_video = await asyncio.wait_for(run_async(
@@ -325,6 +407,8 @@ async def get_random_video(metadata: List[VideoMetadata], check_video: bool) ->
             return None
         except asyncio.TimeoutError:
             continue
+        if random_video is not None:
+            break
 
     # IP is not blocked, video is not fake, but video download failed for some reason. We don't
     # know why it failed so we won't punish the miner, but we will check the description only.
@@ -334,50 +418,76 @@ async def get_random_video(metadata: List[VideoMetadata], check_video: bool) ->
     return random_metadata, random_video
 
 
-async def random_check(random_meta_and_vid: List[VideoMetadata], imagebind: ImageBind) -> bool:
+async def embed_text_cached(text: str, imagebind: ImageBind) -> torch.Tensor:
+    """
+    ImageBind text embedding behind an LRU cache keyed on the text. Descriptions and
+    topic queries repeat often, and only cache misses take GPU_SEMAPHORE.
+    """
+    emb = _text_embedding_cache.get(text)
+    if emb is not None:
+        _text_embedding_cache.move_to_end(text)
+        return emb
+    async with GPU_SEMAPHORE:
+        emb = await imagebind.embed_text_async([text])
+    _text_embedding_cache[text] = emb
+    if len(_text_embedding_cache) > TEXT_EMBEDDING_CACHE_SIZE:
+        _text_embedding_cache.popitem(last=False)
+    return emb
+
+
+async def embed_random_check(random_meta_and_vid: List[VideoMetadata], imagebind: ImageBind) -> torch.Tensor:
+    """
+    ImageBind forward passes for random_check, holding GPU_SEMAPHORE only while they run.
+    Returns the description embedding, or the stacked video, audio and description
+    embeddings if the video was downloaded.
+    """
+    random_metadata, random_video = random_meta_and_vid
+
+    if random_video is None:
+        return await embed_text_cached(random_metadata.description, imagebind)
+
+    async with GPU_SEMAPHORE:
+        # the sync embed keeps the whole @torch.no_grad() pass on one executor thread;
+        # embed_async's decorator only covers the loop thread, not its run_async targets
+        embeddings = await run_async(imagebind.embed, [random_metadata.description], [random_video])
+    # Stack as (3, D) so each check is a single batched comparison.
+    return torch.cat([embeddings.video, embeddings.audio, embeddings.description])
+
+
+def random_check(random_meta_and_vid: List[VideoMetadata], computed_embs: torch.Tensor) -> bool:
     random_metadata, random_video = random_meta_and_vid
 
     if random_video is None:
-        desc_embeddings = await imagebind.embed_text_async([random_metadata.description])
-        is_similar_ = is_similar(desc_embeddings, random_metadata.description_emb)
-        strict_is_similar_ = strict_is_similar(desc_embeddings, random_metadata.description_emb)
+        description_emb = torch.tensor([random_metadata.description_emb], device=computed_embs.device)
+        is_similar_ = is_similar(computed_embs, description_emb)
+        strict_is_similar_ = strict_is_similar(computed_embs, description_emb)
         print(f"Description similarity: {is_similar_}, strict description similarity: {strict_is_similar_}")
         return is_similar_
 
     # Video downloaded, check all embeddings
-    embeddings = await imagebind.embed_async([random_metadata.description], [random_video])
-    is_similar_ = (
-        is_similar(embeddings.video, random_metadata.video_emb) and
-        is_similar(embeddings.audio, random_metadata.audio_emb) and
-        is_similar(embeddings.description, random_metadata.description_emb)
-    )
-    strict_is_similar_ = (
-        strict_is_similar(embeddings.video, random_metadata.video_emb) and
-        strict_is_similar(embeddings.audio, random_metadata.audio_emb) and
-        strict_is_similar(embeddings.description, random_metadata.description_emb)
+    submitted_embs = torch.tensor(
+        [random_metadata.video_emb, random_metadata.audio_emb, random_metadata.description_emb],
+        device=computed_embs.device,
     )
+    is_similar_ = is_similar(computed_embs, submitted_embs)
+    strict_is_similar_ = strict_is_similar(computed_embs, submitted_embs)
     print(f"Total similarity: {is_similar_}, strict total similarity: {strict_is_similar_}")
     return is_similar_
 
 
 async def get_num_unique_videos(videos: Videos) -> int:
-    metadata = videos.video_metadata
-    embeddings = Embeddings(
-        video=torch.stack([torch.tensor(v.video_emb) for v in metadata]),
-        audio=torch.stack([torch.tensor(v.audio_emb) for v in metadata]),
-        description=torch.stack([torch.tensor(v.description_emb) for v in metadata]),
-    )
-    novelty_score, is_too_similar = await compute_novelty_score(embeddings)
-    return sum([not is_sim for is_sim in is_too_similar])
+    video_arr = np.asarray([v.video_emb for v in videos.video_metadata], dtype=np.float32)
+    novelty_score, is_too_similar = await compute_novelty_score(video_arr)
+    return is_too_similar.count(False)
 
 
 async def _run_video_scoring(videos: Videos, imagebind: ImageBind, is_check_only: bool) -> float:
     
-    # check video_ids for fake videos
-    if any(not video_utils.is_valid_youtube_id(video.video_id) for video in videos.video_metadata):
+    # check video_ids for fake videos, filter by length and collect embeddings in one pass
+    collected = collect_video_metadata(videos)
+    if collected is None:
         return {"score": FAKE_VIDEO_PUNISHMENT}
-    
-    metadata = metadata_check(videos.video_metadata)[:videos.num_videos]
+    metadata, video_arr, audio_arr, description_arr = collected
     print(f"Filtered {len(videos.video_metadata)} videos down to {len(metadata)} videos")
 
     # return minimum score if no videos were found in video_metadata
@@ -389,23 +499,19 @@ async def _run_video_scoring(videos: Videos, imagebind: ImageBind, is_check_only
     if random_meta_and_vid is None:
         return {"score": FAKE_VIDEO_PUNISHMENT}
 
-    async with GPU_SEMAPHORE:
-        passed_check = await random_check(random_meta_and_vid, imagebind)
-        if not passed_check:
-            return {"score": FAKE_VIDEO_PUNISHMENT}
+    # only the ImageBind forward passes hold the GPU; the comparisons run after release
+    check_embs = await embed_random_check(random_meta_and_vid, imagebind)
+    if not random_check(random_meta_and_vid, check_embs):
+        return {"score": FAKE_VIDEO_PUNISHMENT}
 
-        query_emb = await imagebind.embed_text_async([videos.query])
+    # fake submissions never reach the query embedding
+    query_emb = await embed_text_cached(videos.query, imagebind)
 
     # Upload the videos to Pinecone and deduplicate
     original_length = len(metadata)
-    embeddings = Embeddings(
-        video=torch.stack([torch.tensor(v.video_emb) for v in metadata]).to(imagebind.device),
-        audio=torch.stack([torch.tensor(v.audio_emb) for v in metadata]).to(imagebind.device),
-        description=torch.stack([torch.tensor(v.description_emb) for v in metadata]).to(imagebind.device),
-    )
-    novelty_score, is_too_similar = await compute_novelty_score(embeddings)
-    embeddings = filter_embeddings(embeddings, is_too_similar)
-    metadata = [metadata for metadata, too_similar in zip(metadata, is_too_similar) if not too_similar]
+    embeddings = embeddings_from_arrays(video_arr, audio_arr, description_arr, imagebind.device)
+    novelty_score, is_too_similar = await compute_novelty_score(video_arr)
+    metadata, embeddings = filter_metadata_and_embeddings(metadata, embeddings, is_too_similar)
     print(f"Deduplicated {original_length} videos down to {len(metadata)} videos")
 
     # Filter out "stuffed" descriptions.
@@ -428,33 +534,25 @@ async def _run_video_scoring(videos: Videos, imagebind: ImageBind, is_check_only
             print(f"Extraneous garbage found in text check {really_bad=} {low_quality=} {total=}")
             return {"score": STUFFED_DESCRIPTION_PUNISHMENT}
 
-    metadata = [
-        metadata[idx]
+    is_stuffed = [
+        stuffed[idx][0]
+        or extraneous[idx][1] > 15
+        or extraneous[idx][2] > 50
         for idx in range(len(metadata))
-        if not stuffed[idx][0]
-        and extraneous[idx][1] <= 15
-        and extraneous[idx][2] <= 50
     ]
+    metadata, embeddings = filter_metadata_and_embeddings(metadata, embeddings, is_stuffed)
     if len(metadata) < pre_filter_metadata_length:
         print(f"Filtering {pre_filter_metadata_length} videos down to {len(metadata)} videos to remove token-stuffed descriptions.")
     if len(metadata) == 0:
         return {"score": MIN_SCORE}
 
-    embeddings = filter_stuffed_embeddings(embeddings, stuffed)
-
     # Compute relevance scores
-    video_description_relevance_scores = F.cosine_similarity(
-        embeddings.video, embeddings.description
-    ).tolist()
-    audio_description_relevance_scores = F.cosine_similarity(
-        embeddings.audio, embeddings.description
-    ).tolist()
-    video_query_relevance_scores = F.cosine_similarity(
-        embeddings.video, query_emb
-    ).tolist()
-    audio_query_relevance_scores = F.cosine_similarity(
-        embeddings.audio, query_emb
-    ).tolist()
+    (
+        video_description_relevance_scores,
+        audio_description_relevance_scores,
+        video_query_relevance_scores,
+        audio_query_relevance_scores,
+    ) = compute_relevance_scores(embeddings, query_emb)
 
     # Query relevance score now includes video cosim, audio cosim, and text cosim using higher quality text-only model.
     query_relevance_scores = [
@@ -509,7 +607,7 @@ async def _run_video_scoring(videos: Videos, imagebind: ImageBind, is_check_only
     ''')
 
     if not is_check_only and len(metadata) > 0:
-        video_ids = await run_async(upload_to_pinecone, embeddings, metadata)
+        video_ids = await upload_to_pinecone(embeddings, metadata)
         # Schedule upload to HuggingFace
         video_dataset_uploader.add_videos(
             metadata,
@@ -546,7 +644,7 @@ async def _run_audio_scoring(audios: Audios, imagebind: ImageBind, is_check_only
         return MIN_SCORE
 
     # Check for valid YouTube IDs
-    if any(not video_utils.is_valid_youtube_id(audio.video_id) for audio in audios.audio_metadata):
+    if not all(video_utils.is_valid_youtube_id(audio.video_id) for audio in audios.audio_metadata):
         return FAKE_VIDEO_PUNISHMENT
     
 
@@ -556,8 +654,7 @@ async def _run_audio_scoring(audios: Audios, imagebind: ImageBind, is_check_only
     
 
     # execute the random check on metadata and video
-    async with GPU_SEMAPHORE:
-        query_emb = await imagebind.embed_text_async([audios.query])
+    query_emb = await embed_text_cached(audios.query, imagebind)
     
     embeddings = Embeddings(
         video=None,
@@ -567,8 +664,7 @@ async def _run_audio_scoring(audios: Audios, imagebind: ImageBind, is_check_only
 
     # check and deduplicate videos based on embedding similarity checks. We do this because we're not uploading to pinecone first.
     metadata_is_similar = await deduplicate_audios(embeddings)
-    metadata = [metadata for metadata, too_similar in zip(metadata, metadata_is_similar) if not too_similar]
-    embeddings = filter_embeddings(embeddings, metadata_is_similar)
+    metadata, embeddings = filter_metadata_and_embeddings(metadata, embeddings, metadata_is_similar)
     
     if len(metadata) < len(audios.audio_metadata):
         print(f"Deduplicated {len(audios.audio_metadata)} audios down to {len(metadata)} audios")
@@ -581,10 +677,8 @@ async def _run_audio_scoring(audios: Audios, imagebind: ImageBind, is_check_only
     pre_filter_metadata_length = len(metadata)
     # check scores from index for being too similar
     is_too_similar = [score < DIFFERENCE_THRESHOLD for score in local_novelty_scores]
-    # filter out metadata too similar
-    metadata = [metadata for metadata, too_similar in zip(metadata, is_too_similar) if not too_similar]
-    # filter out embeddings too similar
-    embeddings = filter_embeddings(embeddings, is_too_similar)
+    # filter out metadata and embeddings too similar
+    metadata, embeddings = filter_metadata_and_embeddings(metadata, embeddings, is_too_similar)
     if len(metadata) < pre_filter_metadata_length:
         print(f"Filtering {pre_filter_metadata_length} audios down to {len(metadata)} audios that are too similar to audios in our index.")
 
@@ -660,7 +754,7 @@ async def _run_audio_scoring(audios: Audios, imagebind: ImageBind, is_check_only
     
     if not is_check_only and len(metadata) > 0:
         # Upload metadata and schedule dataset upload
-        audio_ids = await run_async(upload_to_pinecone_audio, embeddings, metadata)
+        audio_ids = await upload_to_pinecone_audio(embeddings, metadata)
 
         audio_dataset_uploader.add_audios(
             metadata,